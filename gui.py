@@ -930,7 +930,7 @@ class KackyWatcherGUI:
                     
                     # Check upcoming servers
                     if mn in self.watcher.state.upcoming_by_map:
-                        for s, sec in self.watcher.state.upcoming_by_map[mn]:
+                        for s, sec in self.watcher.state.sorted_upcoming(mn):
                             if sec < eta_sec:
                                 eta_sec = sec
                                 if s:
@@ -950,7 +950,7 @@ class KackyWatcherGUI:
                 
                 # For live maps, also show upcoming servers (different server, scheduled later)
                 if mn in live_set and mn in self.watcher.state.upcoming_by_map:
-                    for s, sec in self.watcher.state.upcoming_by_map[mn]:
+                    for s, sec in self.watcher.state.sorted_upcoming(mn):
                         if sec > 0:  # Only show if there's an actual ETA
                             tracked_display_lines.append((sec, f"- {mn} will be live in {sec//60}:{sec%60:02d} on {s}"))
             
@@ -32,16 +32,42 @@ def test_watcher_state_update_from_fetch():
     assert state.eta_seconds_by_map[385] == 620  # 10:20 = 10*60 + 20
 
 
+@pytest.mark.parametrize("live_first", [True, False])
+def test_watcher_state_update_from_fetch_live_and_upcoming(live_first):
+    """Test a new map that is live on one server and upcoming on another in one fetch."""
+    state = WatcherState()
+    live_row = {"map_number": "379", "server": "Server 1", "is_live": True, "remaining_time": "300"}
+    eta_row = {"map_number": "379", "server": "Server 2", "is_live": False, "eta": "5:00"}
+    rows = [live_row, eta_row] if live_first else [eta_row, live_row]
+    
+    live_now = state.update_from_fetch(rows, {379})
+    
+    assert live_now == {379}
+    assert 379 in state.live_until_by_map
+    assert state.eta_seconds_by_map[379] == 300
+    assert state.server_by_map[379] == "Server 2"
+    assert state.upcoming_by_map[379] == {"Server 2": 300}
+
+
 def test_watcher_state_countdown_etas():
     """Test ETA countdown."""
     state = WatcherState()
     state.eta_seconds_by_map[385] = 100
-    state.upcoming_by_map[385] = [("Server 11", 100)]
+    state.upcoming_by_map[385] = {"Server 11": 100}
     
     state.countdown_etas(10)
     
     assert state.eta_seconds_by_map[385] == 90
-    assert state.upcoming_by_map[385][0][1] == 90
+    assert state.upcoming_by_map[385]["Server 11"] == 90
+
+
+def test_watcher_state_sorted_upcoming():
+    """Test upcoming servers are returned soonest first."""
+    state = WatcherState()
+    state.upcoming_by_map[385] = {"Server 11": 300, "Server 2": 100}
+    
+    assert state.sorted_upcoming(385) == [("Server 2", 100), ("Server 11", 300)]
+    assert state.sorted_upcoming(379) == []
 
 
 def test_watcher_state_get_live_summary():
@@ -80,6 +106,85 @@ def test_watcher_state_cleanup_expired():
     assert 385 in state.live_servers_by_map
 
 
+def test_watcher_state_next_live_window_expiry():
+    """Test next live window expiry follows re-timed and removed windows."""
+    state = WatcherState()
+    now_ts = time.time()
+    
+    state.live_until_by_map[379] = now_ts + 100
+    state.live_until_by_map[385] = now_ts + 300
+    assert state.get_next_live_window_expiry(now_ts) == now_ts + 100
+    
+    # Re-synced window moves later; removed window no longer counts
+    state.live_until_by_map[379] = now_ts + 500
+    assert state.get_next_live_window_expiry(now_ts) == now_ts + 300
+    del state.live_until_by_map[385]
+    assert state.get_next_live_window_expiry(now_ts) == now_ts + 500
+    assert state.get_next_live_window_expiry(now_ts, watched={391}) is None
+
+
+def test_watcher_state_has_expiring_live_windows():
+    """Test expiring live window check against the soonest window and watched maps."""
+    state = WatcherState()
+    now_ts = time.time()
+    assert not state.has_expiring_live_windows(now_ts, 60)
+    
+    # Soonest window is past the cutoff (60 + 5 margin)
+    state.live_until_by_map[379] = now_ts + 120
+    assert not state.has_expiring_live_windows(now_ts, 60)
+    
+    # Soonest window is unwatched; a watched one is also within the cutoff
+    state.live_until_by_map[400] = now_ts + 10
+    state.live_until_by_map[385] = now_ts + 50
+    assert state.has_expiring_live_windows(now_ts, 60)  # watched=None
+    assert state.has_expiring_live_windows(now_ts, 60, watched={379, 385})
+    assert state.has_expiring_live_windows(now_ts, 60, watched={400})
+    # Only the unwatched window expires soon
+    assert not state.has_expiring_live_windows(now_ts, 60, watched={379})
+
+
+def test_watcher_state_next_eta_expiry():
+    """Test next ETA expiry over single ETAs and upcoming servers."""
+    state = WatcherState()
+    now_ts = time.time()
+    watched = {379, 385}
+    assert state.get_next_eta_expiry(watched, now_ts) is None
+    
+    state.eta_seconds_by_map[379] = 120
+    state.eta_seconds_by_map[400] = 5  # unwatched
+    assert state.get_next_eta_expiry(watched, now_ts) == 120
+    
+    # Live map: its single ETA is skipped, its upcoming servers still count
+    state.live_until_by_map[385] = now_ts + 200
+    state.eta_seconds_by_map[385] = 10
+    state.upcoming_by_map[385] = {"Server 2": 0, "Server 3": 60}
+    assert state.get_next_eta_expiry(watched, now_ts) == 60
+
+
+def test_watcher_state_get_nearest_eta():
+    """Test nearest ETA and triggering maps for non-live and live maps."""
+    state = WatcherState()
+    now_ts = time.time()
+    watched = {379, 385, 391}
+    
+    # Empty state: sentinel ETA and nothing triggering
+    assert state.get_nearest_eta(watched, 60, now_ts) == (10**9, [])
+    
+    # Non-live map with an ETA below threshold, one above, one unwatched
+    state.eta_seconds_by_map[379] = 45
+    state.server_by_map[379] = "Server 1"
+    state.eta_seconds_by_map[391] = 300
+    state.eta_seconds_by_map[400] = 10
+    # Live map whose soonest upcoming server is below threshold
+    state.live_until_by_map[385] = now_ts + 200
+    state.eta_seconds_by_map[385] = 5  # ignored while live
+    state.upcoming_by_map[385] = {"Server 2": 90, "Server 3": 30}
+    
+    nearest, triggering = state.get_nearest_eta(watched, 60, now_ts)
+    assert nearest == 30
+    assert sorted(triggering) == [(379, 45, "Server 1"), (385, 30, "Server 3")]
+
+
 def test_watcher_state_get_newly_live():
     """Test getting newly live maps."""
     state = WatcherState()
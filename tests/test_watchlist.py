@@ -60,6 +60,19 @@ def test_load_watchlist_with_formatting():
         os.unlink(fpath)
 
 
+def test_load_watchlist_mixed_lines():
+    """Test loading watchlist with indentation, blank lines and non-map lines."""
+    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
+        f.write("  379 - some text\n\n  # 12\nabc 9\n\t385\n391")
+        fpath = f.name
+    
+    try:
+        watched = load_watchlist(fpath)
+        assert watched == {379, 385, 391}
+    finally:
+        os.unlink(fpath)
+
+
 def test_save_watchlist():
     """Test saving watchlist."""
     with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
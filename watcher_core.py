@@ -16,6 +16,9 @@ from map_status_manager import get_tracking_maps
 from watcher_state import WatcherState
 from path_utils import get_map_status_file
 
+# ETA cells are "M:SS" / "MM:SS"
+_ETA_RE = re.compile(r"^(\d{1,2}):(\d{2})$")
+
 
 class KackyWatcher:
     """
@@ -122,7 +125,7 @@ class KackyWatcher:
         # 2. Map added with no data - fetch to get ETA/live status
         if self.watchlist_added:
             # Check if we have data for the new maps
-            new_maps = self.watched - set(self.state.eta_seconds_by_map.keys()) - set(self.state.live_until_by_map.keys())
+            new_maps = self.watched.difference(self.state.eta_seconds_by_map, self.state.live_until_by_map)
             if new_maps:
                 fetch_reason = "watchlist_added"
                 should_fetch = True
@@ -130,10 +133,7 @@ class KackyWatcher:
                 return should_fetch, fetch_reason, triggering_maps
         
         # 3. Resync time for live maps (1 minute after going live) - to sync remaining time
-        maps_needing_resync = []
-        for mn, resync_time in list(self.live_map_resync_times.items()):
-            if now_ts >= resync_time:
-                maps_needing_resync.append(mn)
+        maps_needing_resync = [mn for mn, resync_time in self.live_map_resync_times.items() if now_ts >= resync_time]
         
         if maps_needing_resync:
             fetch_reason = "live_resync"
@@ -325,7 +325,7 @@ class KackyWatcher:
             Tuple of (live_summary: List[int], tracked_lines: List[tuple[int, str]])
         """
         def eta_to_seconds(eta: str) -> int:
-            m = re.match(r"^(\d{1,2}):(\d{2})$", eta)
+            m = _ETA_RE.match(eta)
             if not m:
                 return 10**9
             return int(m.group(1)) * 60 + int(m.group(2))
@@ -372,7 +372,7 @@ class KackyWatcher:
             
             info = earliest_eta_by_map.get(mn)
             if did_fetch and info:
-                m = re.match(r"^(\d{1,2}):(\d{2})$", info.get("eta", ""))
+                m = _ETA_RE.match(info.get("eta", ""))
                 if m:
                     eta_sec = int(m.group(1)) * 60 + int(m.group(2))
                 if info.get("server"):
@@ -382,7 +382,7 @@ class KackyWatcher:
             else:
                 # Use predicted ETA if available
                 if mn in self.state.upcoming_by_map and self.state.upcoming_by_map[mn]:
-                    s, sec = self.state.upcoming_by_map[mn][0]
+                    s, sec = self.state.sorted_upcoming(mn)[0]
                     eta_sec = sec
                     if s:
                         line = f"- {mn} will be live in {sec//60}:{sec%60:02d} on {s}"
@@ -402,7 +402,7 @@ class KackyWatcher:
         # Also add upcoming servers for live maps
         for mn in live_summary:
             if mn in self.state.upcoming_by_map and self.state.upcoming_by_map[mn]:
-                for s, sec in self.state.upcoming_by_map[mn]:
+                for s, sec in self.state.sorted_upcoming(mn):
                     tracked_lines.append((sec, f"- {mn} will be live in {sec//60}:{sec%60:02d} on {s}"))
         
         return live_summary, tracked_lines
@@ -431,21 +431,25 @@ class KackyWatcher:
             
             # Handle tracked maps whose ETA has reached 0 - automatically mark as live locally
             expired_etas = []
+            live_until_get = self.state.live_until_by_map.get
             for mn in self.watched:
-                # Check if map's ETA has hit 0 and it's not already live
+                # Maps that are already live can't expire into live again
+                until_ts = live_until_get(mn)
+                if until_ts is not None and until_ts > now_ts:
+                    continue
+                # Check if map's ETA has hit 0
                 if mn in self.state.eta_seconds_by_map and self.state.eta_seconds_by_map[mn] <= 0:
-                    if mn not in self.state.live_until_by_map or self.state.live_until_by_map[mn] <= now_ts:
-                        expired_etas.append(mn)
+                    expired_etas.append(mn)
                 # Check upcoming servers
                 if mn in self.state.upcoming_by_map:
-                    for srv, sec in self.state.upcoming_by_map[mn]:
+                    for srv, sec in self.state.upcoming_by_map[mn].items():
                         if sec <= 0:
-                            if mn not in self.state.live_until_by_map or self.state.live_until_by_map[mn] <= now_ts:
-                                if mn not in expired_etas:
-                                    expired_etas.append(mn)
-                                break
+                            if mn not in expired_etas:
+                                expired_etas.append(mn)
+                            break
             
             # Automatically mark expired ETAs as live locally (no fetch needed)
+            notified_now: List[int] = []
             for mn in expired_etas:
                 if mn not in self.state.live_until_by_map or self.state.live_until_by_map[mn] <= now_ts:
                     # Mark as live with server's uptime duration
@@ -456,20 +460,24 @@ class KackyWatcher:
                     self.live_map_resync_times[mn] = now_ts + 60.0
                     logging.debug("Map #%s ETA expired locally, marked as live (server uptime %ds, resync in 60s)", mn, server_uptime)
                     if server:
-                        self.state.live_servers_by_map.setdefault(mn, set()).add(server)
+                        self.state.live_servers_by_map[mn].add(server)
                     # Remove from ETA tracking since it's now live
                     # Keep upcoming_by_map for other servers, but remove the primary ETA
                     self.state.eta_seconds_by_map.pop(mn, None)
                     # Remove server from upcoming if it matches
-                    if mn in self.state.upcoming_by_map and server:
-                        self.state.upcoming_by_map[mn] = [(s, t) for s, t in self.state.upcoming_by_map[mn] if s != server]
-                        if not self.state.upcoming_by_map[mn]:
+                    upcoming = self.state.upcoming_by_map.get(mn)
+                    if upcoming is not None and server:
+                        upcoming.pop(server, None)
+                        if not upcoming:
                             del self.state.upcoming_by_map[mn]
                     # Notify if this is newly live
                     if mn not in self.state.notified_live:
                         self.on_live_notification(mn, server)
-                        self.state.mark_notified({mn})
+                        notified_now.append(mn)
                         logging.debug("KACKY MAP LIVE: #%s on %s", mn, server if server else "<unknown server>")
+            # expired_etas holds each map once, so notifications can be recorded after the loop
+            if notified_now:
+                self.state.mark_notified(set(notified_now))
             
             # Check if we should fetch (simplified logic)
             if force_fetch:
@@ -563,10 +571,10 @@ class KackyWatcher:
                 
                 # Clear resync times for maps that were resynced (they were just fetched)
                 if fetch_reason == "live_resync":
-                    for mn in list(self.live_map_resync_times.keys()):
-                        if now_ts >= self.live_map_resync_times[mn]:
-                            del self.live_map_resync_times[mn]
-                            logging.debug("Cleared resync time for map #%s after resync fetch", mn)
+                    resynced = [mn for mn, resync_time in self.live_map_resync_times.items() if now_ts >= resync_time]
+                    for mn in resynced:
+                        del self.live_map_resync_times[mn]
+                        logging.debug("Cleared resync time for map #%s after resync fetch", mn)
                 
                 # Update periodic refetch timer after successful fetch
                 # Check if we have unknown time maps (maps with no ETA and not live)
@@ -596,34 +604,39 @@ class KackyWatcher:
                 # it will be recalculated on the next should_fetch call
             
             # Handle live time expiration locally (no fetch needed)
-            expired_live_maps = []
-            for mn in list(self.state.live_until_by_map.keys()):
-                if self.state.live_until_by_map[mn] <= now_ts:
-                    expired_live_maps.append(mn)
+            # (snapshot: the GUI thread also removes live windows)
+            expired_live_maps = [mn for mn, until_ts in list(self.state.live_until_by_map.items()) if until_ts <= now_ts]
             
             # Remove expired live maps locally
             for mn in expired_live_maps:
-                del self.state.live_until_by_map[mn]
+                self.state.live_until_by_map.pop(mn, None)
                 self.state.live_servers_by_map.pop(mn, None)
                 self.live_map_resync_times.pop(mn, None)
-                self.state.notified_live.discard(mn)  # Clear notification so it can notify again if it goes live
                 logging.debug("Map #%s live time expired locally, removed from live state", mn)
+            # Clear notifications so they can notify again if they go live
+            if expired_live_maps:
+                self.state.clear_notifications_for(set(expired_live_maps))
             
             # Build live summary from local state only
             all_live_maps = set()
+            notified_now = []
+            live_until_get = self.state.live_until_by_map.get
             for mn in self.watched:
-                if mn in self.state.live_until_by_map and self.state.live_until_by_map[mn] > now_ts:
+                until_ts = live_until_get(mn)
+                if until_ts is not None and until_ts > now_ts:
                     all_live_maps.add(mn)
                     # Notify if newly live (from ETA expiration)
                     if mn not in self.state.notified_live:
                         server = self.state.live_servers_by_map.get(mn, set())
                         server_str = ", ".join(sorted(server)) if server else ""
                         self.on_live_notification(mn, server_str)
-                        self.state.mark_notified({mn})
+                        notified_now.append(mn)
                         logging.debug("KACKY MAP LIVE: #%s on %s", mn, server_str if server_str else "<unknown server>")
                         # Schedule resync 1 minute after going live
                         self.live_map_resync_times[mn] = now_ts + 60.0
                         logging.debug("Scheduled resync for map #%s in 60s", mn)
+            if notified_now:
+                self.state.mark_notified(set(notified_now))
             
             # Format and send summary (use local state, not fetch data)
             live_summary, tracked_lines = self.format_summary([], False, all_live_maps if all_live_maps else None)
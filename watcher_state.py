@@ -3,13 +3,26 @@ State management module for Kacky Watcher.
 Tracks ETAs, live windows, servers, and notification state.
 """
 import logging
+import sys
 import time
-import re
+from collections import defaultdict
+from itertools import chain
+from operator import itemgetter
 from typing import Dict, List, Set, Tuple, Optional
 
 from map_status_manager import get_server_uptimes
 from path_utils import get_map_status_file
 
+# Known server uptimes (in seconds, always full minutes):
+# Servers 1-4: 10 minutes, Servers 5-8: 13 minutes, Servers 9-10: 15 minutes
+_DEFAULT_UPTIMES: Dict[str, int] = {
+    f"Server {n}": 600 if n < 5 else 780 if n < 9 else 900 for n in range(1, 11)
+}
+_DEFAULT_UPTIME_FALLBACK = 600
+
+# Sort/min key for (server, seconds) pairs
+_BY_SECONDS = itemgetter(1)
+
 
 class WatcherState:
     """
@@ -20,6 +33,17 @@ class WatcherState:
     - Notification tracking
     """
     
+    __slots__ = (
+        "live_duration_seconds",
+        "eta_seconds_by_map",
+        "server_by_map",
+        "live_until_by_map",
+        "live_servers_by_map",
+        "upcoming_by_map",
+        "notified_live",
+        "server_uptime_seconds",
+    )
+    
     def __init__(self, live_duration_seconds: int = 600):
         """
         Initialize watcher state.
@@ -33,24 +57,15 @@ class WatcherState:
         self.server_by_map: Dict[int, str] = {}
         # Persist live state for a period (maps are ~10 minutes live)
         self.live_until_by_map: Dict[int, float] = {}
-        self.live_servers_by_map: Dict[int, Set[str]] = {}
-        # Track multiple upcoming per map (server, seconds)
-        self.upcoming_by_map: Dict[int, List[Tuple[str, int]]] = {}
+        self.live_servers_by_map: Dict[int, Set[str]] = defaultdict(set)
+        # Track multiple upcoming per map (server -> seconds)
+        self.upcoming_by_map: Dict[int, Dict[str, int]] = defaultdict(dict)
         # Remember which watched maps are currently live to avoid repeat notifications
         self.notified_live: Set[int] = set()
         
         # Server uptime tracking (in seconds, always full minutes)
         # Initialize with known defaults, then load persisted values if available
-        # Servers 1-4: 10 minutes (600 seconds)
-        # Servers 5-8: 13 minutes (780 seconds)
-        # Servers 9-10: 15 minutes (900 seconds)
-        self.server_uptime_seconds: Dict[str, int] = {}
-        for server_num in range(1, 5):
-            self.server_uptime_seconds[f"Server {server_num}"] = 600  # 10 minutes
-        for server_num in range(5, 9):
-            self.server_uptime_seconds[f"Server {server_num}"] = 780  # 13 minutes
-        for server_num in range(9, 11):
-            self.server_uptime_seconds[f"Server {server_num}"] = 900  # 15 minutes
+        self.server_uptime_seconds: Dict[str, int] = dict(_DEFAULT_UPTIMES)
         
         # Load persisted server uptimes from file (overrides defaults)
         try:
@@ -79,18 +94,34 @@ class WatcherState:
         """
         now_ts = time.time()
         live_now: Set[int] = set()  # For reference only
+        # Checked once so skipped debug calls cost nothing per row
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
         
-        # Track maps we have local state for
-        maps_with_local_state = set(self.eta_seconds_by_map.keys()) | set(self.live_until_by_map.keys())
+        # Maps that got local state during this fetch. Nothing is removed while rows are
+        # applied, so "no local state before this fetch" is "added in this fetch, or in
+        # neither dict" - no need to snapshot every tracked/live key up front.
+        added_now: Set[int] = set()
+        etas = self.eta_seconds_by_map
+        server_by_map = self.server_by_map
+        live_until = self.live_until_by_map
+        live_servers = self.live_servers_by_map
+        upcoming = self.upcoming_by_map
         
+        # Only rows for watched maps matter; a digit check filters out malformed
+        # map numbers without raising and catching ValueError per row.
+        # Each map number is parsed once and kept alongside its row.
+        wanted_rows: List[Tuple[int, Dict[str, str]]] = []
         for r in rows:
-            try:
-                mn = int(r.get("map_number", "0"))
-            except ValueError:
-                continue
-            if mn not in watched:
-                continue
-            srv = r.get("server", "") or ""
+            mn_str = r.get("map_number") or ""
+            if mn_str.isdigit():
+                mn = int(mn_str)
+                if mn in watched:
+                    wanted_rows.append((mn, r))
+        
+        for mn, r in wanted_rows:
+            # Server labels repeat across rows and fetches; intern them so the
+            # per-map server dicts compare keys by identity
+            srv = sys.intern(r.get("server", "") or "")
             
             if r.get("is_live"):
                 remaining_time_str = r.get("remaining_time", "") or ""
@@ -102,7 +133,8 @@ class WatcherState:
                 if needs_retry:
                     # The parser set remaining_time to server_uptime as a placeholder
                     # Don't update state with this placeholder - handle locally using server uptime
-                    logging.debug("Map #%s has empty time cell (transitioning), skipping time update (will use server uptime locally)", mn)
+                    if debug:
+                        logging.debug("Map #%s has empty time cell (transitioning), skipping time update (will use server uptime locally)", mn)
                     # Still add to live_now for reference, but don't update live_until_by_map
                     live_now.add(mn)
                     continue
@@ -111,30 +143,35 @@ class WatcherState:
                 # (see watcher_core.fetch_and_update_server_uptimes)
                 
                 # Update live time if map is already live locally
-                if mn in self.live_until_by_map:
+                if mn in live_until:
                     if remaining_time_str and remaining_time_str.isdigit():
                         remaining_seconds = int(remaining_time_str)
-                        self.live_until_by_map[mn] = now_ts + remaining_seconds
-                        logging.debug("Map #%s live time synced: remaining %ds", mn, remaining_seconds)
+                        live_until[mn] = now_ts + remaining_seconds
+                        if debug:
+                            logging.debug("Map #%s live time synced: remaining %ds", mn, remaining_seconds)
                     if srv:
-                        self.live_servers_by_map.setdefault(mn, set()).add(srv)
+                        live_servers[mn].add(srv)
                 # Only add to live state if we don't have local state for it (new map)
-                elif mn not in maps_with_local_state:
+                elif mn in added_now or mn not in etas:
+                    added_now.add(mn)
                     # New map - add to live state
                     if remaining_time_str and remaining_time_str.isdigit():
                         remaining_seconds = int(remaining_time_str)
-                        self.live_until_by_map[mn] = now_ts + remaining_seconds
-                        logging.debug("Map #%s added to live state (new map): remaining %ds", mn, remaining_seconds)
+                        live_until[mn] = now_ts + remaining_seconds
+                        if debug:
+                            logging.debug("Map #%s added to live state (new map): remaining %ds", mn, remaining_seconds)
                     else:
                         # Use server's uptime instead of default duration
                         server_uptime = self.get_server_uptime(srv)
-                        self.live_until_by_map[mn] = now_ts + server_uptime
-                        logging.debug("Map #%s added to live state (new map): server uptime %ds", mn, server_uptime)
+                        live_until[mn] = now_ts + server_uptime
+                        if debug:
+                            logging.debug("Map #%s added to live state (new map): server uptime %ds", mn, server_uptime)
                     if srv:
-                        self.live_servers_by_map.setdefault(mn, set()).add(srv)
+                        live_servers[mn].add(srv)
                 # If map is in tracked (has ETA), don't change state - it will transition locally when ETA hits 0
-                elif mn in self.eta_seconds_by_map:
-                    logging.debug("Map #%s is tracked locally, keeping tracked state (will transition locally)", mn)
+                elif mn in etas:
+                    if debug:
+                        logging.debug("Map #%s is tracked locally, keeping tracked state (will transition locally)", mn)
                     # Don't change state - keep it tracked, it will go live when ETA hits 0 locally
                 
                 live_now.add(mn)  # For reference
@@ -142,35 +179,38 @@ class WatcherState:
                 # Map is not live on website - update ETA if we have one
                 eta = r.get("eta", "") or ""
                 if eta:
-                    m = re.match(r"^(\d{1,2}):(\d{2})$", eta)
-                    if m:
-                        sec = int(m.group(1)) * 60 + int(m.group(2))
+                    # ETA cells are "M:SS" / "MM:SS"
+                    mm, sep, ss = eta.partition(":")
+                    if sep and 1 <= len(mm) <= 2 and len(ss) == 2 and mm.isdigit() and ss.isdigit():
+                        sec = int(mm) * 60 + int(ss)
                         
                         # Update ETA if map is already tracked
-                        if mn in self.eta_seconds_by_map:
+                        if mn in etas:
                             # Update to sync time
-                            self.eta_seconds_by_map[mn] = sec
-                            self.server_by_map[mn] = srv
-                            logging.debug("Map #%s ETA synced: %ds", mn, sec)
+                            etas[mn] = sec
+                            server_by_map[mn] = srv
+                            if debug:
+                                logging.debug("Map #%s ETA synced: %ds", mn, sec)
                         # Only add to tracked if we don't have local state for it (new map)
-                        elif mn not in maps_with_local_state:
+                        elif mn in added_now or mn not in live_until:
+                            added_now.add(mn)
                             # New map - add to tracked
-                            self.eta_seconds_by_map[mn] = sec
-                            self.server_by_map[mn] = srv
-                            logging.debug("Map #%s added to tracked state (new map): ETA %ds", mn, sec)
+                            etas[mn] = sec
+                            server_by_map[mn] = srv
+                            if debug:
+                                logging.debug("Map #%s added to tracked state (new map): ETA %ds", mn, sec)
                         
                         # Update per-server list
                         if srv:
-                            self.upcoming_by_map.setdefault(mn, [])
-                            existing = {s: t for s, t in self.upcoming_by_map[mn]}
+                            existing = upcoming[mn]
                             if (srv not in existing) or (sec < existing[srv]):
                                 existing[srv] = sec
-                                self.upcoming_by_map[mn] = sorted(existing.items(), key=lambda x: x[1])
                         
                         # If map was live, don't remove it - it will transition locally when time expires
                         # Just update ETA for when it goes live again (or add ETA if it doesn't have one)
-                        if mn in self.live_until_by_map:
-                            logging.debug("Map #%s is live locally, keeping live state (will transition locally)", mn)
+                        if mn in live_until:
+                            if debug:
+                                logging.debug("Map #%s is live locally, keeping live state (will transition locally)", mn)
                             # Don't change state - keep it live, it will go to tracked when time expires locally
         
         return live_now  # For reference only - state is managed locally
@@ -183,15 +223,34 @@ class WatcherState:
         Args:
             decrement_seconds: How many seconds to subtract from each ETA
         """
-        for k in list(self.eta_seconds_by_map.keys()):
-            self.eta_seconds_by_map[k] = max(0, self.eta_seconds_by_map[k] - decrement_seconds)
+        # Iterate a snapshot: the watcher thread adds and removes maps while the GUI
+        # thread counts down. Entries already at 0, or removed since, are left alone.
+        etas = self.eta_seconds_by_map
+        for k, sec in list(etas.items()):
+            if sec > 0 and k in etas:
+                etas[k] = sec - decrement_seconds if sec > decrement_seconds else 0
         
-        for mn, items in list(self.upcoming_by_map.items()):
-            updated = []
-            for s, t in items:
-                new_t = max(0, t - decrement_seconds)
-                updated.append((s, new_t))
-            self.upcoming_by_map[mn] = updated
+        # The watcher thread adds maps and pops servers while the GUI thread counts
+        # down, so iterate snapshots and skip servers removed in the meantime
+        for items in list(self.upcoming_by_map.values()):
+            for s, t in list(items.items()):
+                if t > 0 and s in items:
+                    items[s] = t - decrement_seconds if t > decrement_seconds else 0
+    
+    def sorted_upcoming(self, map_number: int) -> List[Tuple[str, int]]:
+        """
+        Get the upcoming servers for a map, soonest first.
+        
+        Args:
+            map_number: Map number to look up
+            
+        Returns:
+            List of (server, seconds) tuples sorted by seconds
+        """
+        items = self.upcoming_by_map.get(map_number)
+        if not items:
+            return []
+        return sorted(items.items(), key=_BY_SECONDS)
     
     def cleanup_expired_live_windows(self, now_ts: float) -> None:
         """
@@ -200,10 +259,13 @@ class WatcherState:
         Args:
             now_ts: Current timestamp
         """
-        for mn in list(self.live_until_by_map.keys()):
-            if self.live_until_by_map[mn] <= now_ts:
-                del self.live_until_by_map[mn]
-                self.live_servers_by_map.pop(mn, None)
+        live_until = self.live_until_by_map
+        servers = self.live_servers_by_map
+        # Snapshot: the watcher and GUI threads both write live windows
+        expired = [mn for mn, until_ts in list(live_until.items()) if until_ts <= now_ts]
+        for mn in expired:
+            live_until.pop(mn, None)
+            servers.pop(mn, None)
     
     def get_live_summary(self, watched: Set[int], live_now: Set[int], now_ts: float) -> List[int]:
         """
@@ -217,25 +279,28 @@ class WatcherState:
         Returns:
             Sorted list of map numbers that are live
         """
-        self.cleanup_expired_live_windows(now_ts)
         live_summary: List[int] = []
+        lu = self.live_until_by_map
         
         # If we have a recent fetch (live_now is not empty), use it as source of truth
         # If live_now is empty, we're using cached state, so use live windows
         if live_now:
             # Recent fetch: only show maps that are actually live now
-            # Remove any maps from live_until_by_map that are not in live_now
-            for mn in list(self.live_until_by_map.keys()):
-                if mn not in live_now:
-                    del self.live_until_by_map[mn]
-                    self.live_servers_by_map.pop(mn, None)
+            # Remove expired windows and any maps that are not in live_now in one pass
+            # Snapshot: this runs on the GUI thread while the watcher thread writes windows
+            not_live = [mn for mn, until_ts in list(lu.items()) if until_ts <= now_ts or mn not in live_now]
+            servers = self.live_servers_by_map
+            for mn in not_live:
+                lu.pop(mn, None)
+                servers.pop(mn, None)
             # If a map is in live_now (from recent fetch), it's currently live on the website
             live_summary = sorted(live_now & watched)
         else:
             # No recent fetch: use live windows for persistence
-            for mn in sorted(watched):
-                if mn in self.live_until_by_map and self.live_until_by_map[mn] > now_ts:
-                    live_summary.append(mn)
+            # (walk the live windows rather than sorting the whole watchlist)
+            self.cleanup_expired_live_windows(now_ts)
+            # Keep the expiry check: the watcher thread may write windows after cleanup
+            live_summary = sorted(mn for mn, until_ts in list(lu.items()) if until_ts > now_ts and mn in watched)
         
         return live_summary
     
@@ -251,32 +316,30 @@ class WatcherState:
         Returns:
             Tuple of (nearest_eta_seconds, list of triggering maps as (map_num, eta_sec, server))
         """
+        # Maps with an active live window, resolved once instead of per candidate
+        live_set_now = {mn for mn, ts in self.live_until_by_map.items() if ts > now_ts}
+        server_get = self.server_by_map.get
+        
         nearest_eta = 10**9
         triggering_maps: List[Tuple[int, int, str]] = []
         
-        try:
-            candidates = []
-            # First, check non-live maps (only watched ones)
-            for mn, sec in self.eta_seconds_by_map.items():
-                if sec > 0 and mn in watched:
-                    # Skip if this map is currently live
-                    if mn not in self.live_until_by_map or self.live_until_by_map[mn] <= now_ts:
-                        candidates.append(sec)
-                        if sec <= threshold_sec:
-                            triggering_maps.append((mn, sec, self.server_by_map.get(mn, "")))
-            # Also check upcoming servers for live maps (if they're below threshold and watched)
-            for mn, items in self.upcoming_by_map.items():
-                if mn in watched and mn in self.live_until_by_map and self.live_until_by_map[mn] > now_ts:
-                    # This map is live and watched, check if any upcoming server is below threshold
-                    for s, t in items:
-                        if t > 0 and t <= threshold_sec:
-                            candidates.append(t)
-                            triggering_maps.append((mn, t, s))
-                            break  # only need one below threshold to trigger
-            if candidates:
-                nearest_eta = min(candidates)
-        except ValueError:
-            pass
+        # First, check non-live maps (only watched ones)
+        for mn, sec in self.eta_seconds_by_map.items():
+            if sec > 0 and mn in watched and mn not in live_set_now:
+                if sec < nearest_eta:
+                    nearest_eta = sec
+                if sec <= threshold_sec:
+                    triggering_maps.append((mn, sec, server_get(mn, "")))
+        # Also check upcoming servers for live maps (if they're below threshold and watched)
+        for mn, items in self.upcoming_by_map.items():
+            if mn in watched and mn in live_set_now:
+                # Only the soonest upcoming server matters (one below threshold is enough to trigger)
+                soonest = min(((s, t) for s, t in items.items() if t > 0), key=_BY_SECONDS, default=None)
+                if soonest is not None and soonest[1] <= threshold_sec:
+                    s, t = soonest
+                    if t < nearest_eta:
+                        nearest_eta = t
+                    triggering_maps.append((mn, t, s))
         
         return nearest_eta, triggering_maps
     
@@ -293,11 +356,12 @@ class WatcherState:
         Returns:
             True if any live window (for watched maps if specified) expires within threshold + margin
         """
+        cutoff = now_ts + threshold_sec + margin_sec
         for mn, until_ts in self.live_until_by_map.items():
             # Only check watched maps if watched set is provided
             if watched is not None and mn not in watched:
                 continue
-            if until_ts <= now_ts + threshold_sec + margin_sec:
+            if until_ts <= cutoff:
                 return True
         return False
     
@@ -367,34 +431,17 @@ class WatcherState:
         Returns:
             Seconds until next ETA expires, or None if no ETAs
         """
-        candidates = []
-        # Check single ETAs
-        for mn, sec in self.eta_seconds_by_map.items():
-            if mn in watched and sec > 0:
-                # Skip if this map is currently live
-                if mn not in self.live_until_by_map or self.live_until_by_map[mn] <= now_ts:
-                    candidates.append(sec)
+        # Maps with an active live window, resolved once instead of per candidate
+        live_set_now = {mn for mn, ts in self.live_until_by_map.items() if ts > now_ts}
         
-        # Check upcoming servers for live maps
-        for mn, items in self.upcoming_by_map.items():
-            if mn in watched:
-                # Check if map is live
-                is_live = mn in self.live_until_by_map and self.live_until_by_map[mn] > now_ts
-                if is_live:
-                    # Map is live, check upcoming servers
-                    for s, t in items:
-                        if t > 0:
-                            candidates.append(t)
-                            break
-                else:
-                    # Map not live, check ETAs
-                    for s, t in items:
-                        if t > 0:
-                            candidates.append(t)
-        
-        if not candidates:
-            return None
-        return min(candidates)
+        # Single ETAs (skip maps that are currently live)
+        single_etas = (sec for mn, sec in self.eta_seconds_by_map.items()
+                       if sec > 0 and mn in watched and mn not in live_set_now)
+        # Upcoming servers, live or not
+        upcoming_etas = (t for mn, items in self.upcoming_by_map.items() if mn in watched
+                         for t in items.values() if t > 0)
+        
+        return min(chain(single_etas, upcoming_etas), default=None)
     
     def get_server_uptime(self, server: str) -> int:
         """
@@ -407,8 +454,8 @@ class WatcherState:
             Uptime in seconds (always a full minute)
         """
         if not server:
-            return 600  # Default fallback
-        return self.server_uptime_seconds.get(server, 600)
+            return _DEFAULT_UPTIME_FALLBACK
+        return self.server_uptime_seconds.get(server, _DEFAULT_UPTIME_FALLBACK)
     
     def update_server_uptimes_from_maps_view(self, server_uptimes: Dict[str, int]) -> bool:
         """
@@ -12,6 +12,11 @@ import sys
 from typing import Set
 from pathlib import Path
 
+# Leading map number, e.g. "379 - anything"
+_LEAD_NUM_RE = re.compile(r"\s*(\d+)")
+# Same, anchored at every line start of a whole file; comment lines never match
+_WATCHLIST_NUM_RE = re.compile(r"^\s*(\d+)", re.MULTILINE)
+
 
 def _get_watchlist_file() -> str:
     """
@@ -41,22 +46,12 @@ def load_watchlist(path: str = None) -> Set[int]:
     if path is None:
         path = _get_watchlist_file()
     
-    watched: Set[int] = set()
     if not os.path.exists(path):
-        return watched
+        return set()
     with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if line.isdigit():
-                watched.add(int(line))
-            else:
-                # Allow formats like "379 - anything" by extracting leading number
-                m = re.match(r"\s*(\d+)", line)
-                if m:
-                    watched.add(int(m.group(1)))
-    return watched
+        data = f.read()
+    # Also accepts formats like "379 - anything" by taking the leading number
+    return {int(m.group(1)) for m in _WATCHLIST_NUM_RE.finditer(data)}
 
 
 def save_watchlist(map_numbers: Set[int], path: str = None) -> None:
@@ -93,7 +88,7 @@ def validate_map_number(map_str: str) -> int | None:
     if map_str.isdigit():
         return int(map_str)
     # Try to extract leading number
-    m = re.match(r"\s*(\d+)", map_str)
+    m = _LEAD_NUM_RE.match(map_str)
     if m:
         return int(m.group(1))
     return None
@@ -16,6 +16,36 @@ _NOTIFICATION_INIT_ERROR = None
 # Store notification module globally if available
 _notification_module = None
 
+# MessageBox style flags for the WinAPI fallback
+MB_ICONINFORMATION = 0x00000040
+MB_SETFOREGROUND = 0x00010000
+MB_TOPMOST = 0x00040000
+MB_TASKMODAL = 0x00002000  # Task modal - doesn't block other windows as much
+_MB_FLAGS = MB_ICONINFORMATION | MB_SETFOREGROUND | MB_TOPMOST | MB_TASKMODAL
+
+# Prototyped user32.MessageBoxW, resolved once (see _get_message_box)
+_message_box_w = None
+
+
+def _get_message_box():
+    """
+    Return user32.MessageBoxW with its prototype set, resolving it on first use.
+    
+    Returns:
+        The ctypes function pointer for MessageBoxW
+    """
+    global _message_box_w
+    if _message_box_w is None:
+        import ctypes
+        from ctypes import wintypes
+        
+        message_box = ctypes.windll.user32.MessageBoxW
+        message_box.argtypes = [wintypes.HWND, wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.UINT]
+        message_box.restype = ctypes.c_int
+        _message_box_w = message_box
+    return _message_box_w
+
+
 if platform.system() == "Windows":
     # Try plyer first in both development and EXE mode
     # It works reliably if properly bundled
@@ -25,15 +55,13 @@ if platform.system() == "Windows":
         NOTIFICATION_METHOD = "plyer"
         _is_exe = getattr(sys, 'frozen', False)
         mode = "EXE" if _is_exe else "development"
-        logging.debug(f"Using plyer for notifications ({mode} mode)")
+        logging.debug("Using plyer for notifications (%s mode)", mode)
     except (ImportError, Exception) as e:
         _NOTIFICATION_INIT_ERROR = str(e)
-        logging.debug(f"Plyer not available: {e}, trying Windows API fallback...")
+        logging.debug("Plyer not available: %s, trying Windows API fallback...", e)
         # Fallback to Windows API (MessageBox - most reliable fallback)
         try:
-            import ctypes
-            from ctypes import wintypes
-            user32 = ctypes.windll.user32
+            _get_message_box()
             HAS_NOTIFICATIONS = True
             NOTIFICATION_METHOD = "winapi_msgbox"
             logging.debug("Using Windows MessageBox API for notifications (fallback)")
@@ -41,7 +69,7 @@ if platform.system() == "Windows":
             HAS_NOTIFICATIONS = False
             NOTIFICATION_METHOD = None
             _NOTIFICATION_INIT_ERROR = f"{_NOTIFICATION_INIT_ERROR}; {e2}"
-            logging.debug(f"Windows API also not available: {e2}")
+            logging.debug("Windows API also not available: %s", e2)
 else:
     HAS_NOTIFICATIONS = False
     NOTIFICATION_METHOD = None
@@ -63,7 +91,7 @@ def show_notification(title: str, message: str, duration: int = 5) -> bool:
     """
     if not HAS_NOTIFICATIONS:
         if _NOTIFICATION_INIT_ERROR:
-            logging.debug(f"Windows notifications not available: {_NOTIFICATION_INIT_ERROR}")
+            logging.debug("Windows notifications not available: %s", _NOTIFICATION_INIT_ERROR)
         else:
             logging.debug("Windows notifications not available")
         return False
@@ -83,42 +111,32 @@ def show_notification(title: str, message: str, duration: int = 5) -> bool:
                     timeout=duration,
                     app_name="Kacky Watcher"
                 )
-                logging.debug(f"Notification shown via plyer: {title}")
+                logging.debug("Notification shown via plyer: %s", title)
                 return True
             except Exception as e:
-                logging.warning(f"Plyer notification failed: {e}, trying MessageBox fallback", exc_info=True)
+                logging.warning("Plyer notification failed: %s, trying MessageBox fallback", e, exc_info=True)
                 # Fall through to MessageBox fallback
                 method = "winapi_msgbox"
             
         if method == "winapi_msgbox":
             # Use Windows MessageBox API (most reliable, but blocking)
             try:
-                import ctypes
-                from ctypes import wintypes
-                
-                MB_ICONINFORMATION = 0x00000040
-                MB_SETFOREGROUND = 0x00010000
-                MB_TOPMOST = 0x00040000
-                MB_TASKMODAL = 0x00002000  # Task modal - doesn't block other windows as much
-                flags = MB_ICONINFORMATION | MB_SETFOREGROUND | MB_TOPMOST | MB_TASKMODAL
-                
-                user32 = ctypes.windll.user32
                 # MessageBox is blocking, but it's better than nothing
-                result = user32.MessageBoxW(None, message, title, flags)
-                logging.debug(f"Notification shown via MessageBox: {title}, result={result}")
+                result = _get_message_box()(None, message, title, _MB_FLAGS)
+                logging.debug("Notification shown via MessageBox: %s, result=%s", title, result)
                 return result != 0
             except Exception as e:
-                logging.error(f"MessageBox notification failed: {e}", exc_info=True)
+                logging.error("MessageBox notification failed: %s", e, exc_info=True)
                 return False
         else:
-            logging.debug(f"No valid notification method (method: {method})")
+            logging.debug("No valid notification method (method: %s)", method)
             return False
             
     except Exception as e:
-        logging.error(f"Failed to show notification: {e}", exc_info=True)
+        logging.error("Failed to show notification: %s", e, exc_info=True)
         # Try to log the initialization error if available
         if _NOTIFICATION_INIT_ERROR:
-            logging.error(f"Notification initialization error was: {_NOTIFICATION_INIT_ERROR}")
+            logging.error("Notification initialization error was: %s", _NOTIFICATION_INIT_ERROR)
         return False
 
 
@@ -135,7 +153,7 @@ def show_notification_async(title: str, message: str, duration: int = 5) -> None
         try:
             show_notification(title, message, duration)
         except Exception as e:
-            logging.error(f"Error in notification thread: {e}", exc_info=True)
+            logging.error("Error in notification thread: %s", e, exc_info=True)
     
     thread = threading.Thread(target=_show, daemon=True, name="NotificationThread")
     thread.start()